@@ -1,3 +1,6 @@
+import logging
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from skyvern.constants import SKYVERN_DIR
@@ -20,13 +23,36 @@ class Settings(BaseSettings):
     # If the task has been running for more steps than this ratio of the max steps per run, then we'll log a warning.
     LONG_RUNNING_TASK_WARNING_RATIO: float = 0.95
     MAX_RETRIES_PER_STEP: int = 5
+    # Random delay range in seconds between actions to avoid bot detection. Set to null to disable the delay.
+    ACTION_JITTER_RANGE: tuple[float, float] | None = (1.0, 2.0)
+    # How to record the screenshot after each action: "full_page", "viewport", "off" or "final_only".
+    # "final_only" records the after action artifacts once per step instead of after every action.
+    SCREENSHOT_AFTER_ACTION_MODE: Literal["full_page", "viewport", "off", "final_only"] = "viewport"
+    # JPEG quality of the screenshots taken after actions
+    SCREENSHOT_AFTER_ACTION_QUALITY: int = 70
+    # Format of the full page screenshot taken when the task is finalized. "png" keeps it pixel exact.
+    FINAL_SCREENSHOT_FORMAT: Literal["png", "jpeg"] = "jpeg"
+    # JPEG quality of the final screenshot, ignored for "png"
+    FINAL_SCREENSHOT_QUALITY: int = 80
     DEBUG_MODE: bool = False
     DATABASE_STRING: str = "postgresql+psycopg://skyvern@localhost/skyvern"
     PROMPT_ACTION_HISTORY_WINDOW: int = 5
+    # Record the full element tree next to the trimmed one (which is the one used in the prompt)
+    STORE_FULL_ELEMENT_TREE: bool = False
 
     ENV: str = "local"
     EXECUTE_ALL_STEPS: bool = True
     JSON_LOGGING: bool = False
+    # Log calls below this level are dropped before the log record is built. When it isn't set, the level is DEBUG if
+    # DEBUG_MODE is on and INFO otherwise.
+    LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] | None = None
+
+    # Webhooks are retried on network errors, 429 and 5xx responses with exponential backoff
+    WEBHOOK_MAX_RETRIES: int = 4
+    WEBHOOK_BASE_DELAY_MS: int = 1000
+    WEBHOOK_MAX_DELAY_MS: int = 60000
+    # Number of workers sending the task webhooks in the background
+    WEBHOOK_DISPATCHER_CONSUMERS: int = 8
     PORT: int = 8000
 
     # Secret key for JWT. Please generate your own secret key in production
@@ -87,5 +113,13 @@ class Settings(BaseSettings):
         else:
             return self.EXECUTE_ALL_STEPS
 
+    def get_log_level(self) -> int:
+        """
+        :return: The logging level of LOG_LEVEL. If it isn't set, DEBUG when DEBUG_MODE is on, else INFO
+        """
+        if self.LOG_LEVEL:
+            return logging.getLevelNamesMapping()[self.LOG_LEVEL]
+        return logging.DEBUG if self.DEBUG_MODE else logging.INFO
+
 
 settings = Settings()
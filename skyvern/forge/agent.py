@@ -1,12 +1,15 @@
 import asyncio
-import json
+import logging
 import random
 from datetime import datetime
-from typing import Any, Tuple
+from typing import TYPE_CHECKING, Any, Tuple
 
-import requests
+import orjson
 import structlog
+from cachetools import LRUCache
 from playwright._impl._errors import TargetClosedError
+from pydantic import TypeAdapter
+from structlog.contextvars import bind_contextvars, unbind_contextvars
 
 from skyvern import analytics
 from skyvern.exceptions import (
@@ -19,50 +22,66 @@ from skyvern.exceptions import (
 from skyvern.forge import app
 from skyvern.forge.prompts import prompt_engine
 from skyvern.forge.sdk.agent import Agent
+from skyvern.forge.sdk.api.webhook import WebhookJob, log_webhook_payload, post_webhook
 from skyvern.forge.sdk.artifact.models import ArtifactType
 from skyvern.forge.sdk.core import skyvern_context
 from skyvern.forge.sdk.core.security import generate_skyvern_signature
+from skyvern.forge.sdk.forge_log import is_log_level_enabled
 from skyvern.forge.sdk.models import Organization, Step, StepStatus
-from skyvern.forge.sdk.schemas.tasks import Task, TaskRequest, TaskStatus
+from skyvern.forge.sdk.schemas.tasks import Task, TaskRequest, TaskResponse, TaskStatus
 from skyvern.forge.sdk.settings_manager import SettingsManager
-from skyvern.forge.sdk.workflow.context_manager import WorkflowRunContext
-from skyvern.forge.sdk.workflow.models.block import TaskBlock
-from skyvern.forge.sdk.workflow.models.workflow import Workflow, WorkflowRun
-from skyvern.webeye.actions.actions import (
-    Action,
-    ActionType,
-    CompleteAction,
-    UserDefinedError,
-    WebAction,
-    parse_actions,
-)
+from skyvern.webeye.actions.actions import Action, ActionType, CompleteAction, UserDefinedError, parse_actions
 from skyvern.webeye.actions.handler import ActionHandler
 from skyvern.webeye.actions.models import AgentStepOutput, DetailedAgentStepOutput
 from skyvern.webeye.actions.responses import ActionResult
 from skyvern.webeye.browser_factory import BrowserState
 from skyvern.webeye.scraper.scraper import ScrapedPage, scrape_website
 
+if TYPE_CHECKING:
+    # Only used for type hints, the workflow modules import the agent through skyvern.forge.app
+    from skyvern.forge.sdk.workflow.context_manager import WorkflowRunContext
+    from skyvern.forge.sdk.workflow.models.block import TaskBlock
+    from skyvern.forge.sdk.workflow.models.workflow import Workflow, WorkflowRun
+
 LOG = structlog.get_logger()
 
+# (step_id, modified_at) -> serialized action results of the step, without the enclosing brackets
+STEP_ACTION_RESULTS_JSON_CACHE: LRUCache[tuple[str, datetime], str] = LRUCache(maxsize=1024)
+# execute_task_webhook signs and posts the bytes this adapter dumps, without a str round-trip
+TASK_RESPONSE_ADAPTER = TypeAdapter(TaskResponse)
+
+
+def build_update_diff(model: Step | Task, updates: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """
+    Get the old and new values of the fields the updates change.
+    """
+    diff = {}
+    for key, value in updates.items():
+        old_value = getattr(model, key)
+        if old_value != value:
+            diff[key] = {"old": old_value, "new": value}
+    return diff
+
 
 class ForgeAgent(Agent):
     def __init__(self) -> None:
-        if SettingsManager.get_settings().ADDITIONAL_MODULES:
-            for module in SettingsManager.get_settings().ADDITIONAL_MODULES:
+        settings = SettingsManager.get_settings()
+        if settings.ADDITIONAL_MODULES:
+            for module in settings.ADDITIONAL_MODULES:
                 LOG.info("Loading additional module", module=module)
                 __import__(module)
-            LOG.info("Additional modules loaded", modules=SettingsManager.get_settings().ADDITIONAL_MODULES)
+            LOG.info("Additional modules loaded", modules=settings.ADDITIONAL_MODULES)
         LOG.info(
             "Initializing ForgeAgent",
-            env=SettingsManager.get_settings().ENV,
-            execute_all_steps=SettingsManager.get_settings().EXECUTE_ALL_STEPS,
-            browser_type=SettingsManager.get_settings().BROWSER_TYPE,
-            max_scraping_retries=SettingsManager.get_settings().MAX_SCRAPING_RETRIES,
-            video_path=SettingsManager.get_settings().VIDEO_PATH,
-            browser_action_timeout_ms=SettingsManager.get_settings().BROWSER_ACTION_TIMEOUT_MS,
-            max_steps_per_run=SettingsManager.get_settings().MAX_STEPS_PER_RUN,
-            long_running_task_warning_ratio=SettingsManager.get_settings().LONG_RUNNING_TASK_WARNING_RATIO,
-            debug_mode=SettingsManager.get_settings().DEBUG_MODE,
+            env=settings.ENV,
+            execute_all_steps=settings.EXECUTE_ALL_STEPS,
+            browser_type=settings.BROWSER_TYPE,
+            max_scraping_retries=settings.MAX_SCRAPING_RETRIES,
+            video_path=settings.VIDEO_PATH,
+            browser_action_timeout_ms=settings.BROWSER_ACTION_TIMEOUT_MS,
+            max_steps_per_run=settings.MAX_STEPS_PER_RUN,
+            long_running_task_warning_ratio=settings.LONG_RUNNING_TASK_WARNING_RATIO,
+            debug_mode=settings.DEBUG_MODE,
         )
 
     async def validate_step_execution(
@@ -84,8 +103,9 @@ class ForgeAgent(Agent):
         if not has_valid_step_status:
             reasons.append(f"invalid_step_status:{step.status}")
         # can't execute if the task has another step that is running
-        steps = await app.DATABASE.get_task_steps(task_id=task.task_id, organization_id=task.organization_id)
-        has_no_running_steps = not any(step.status == StepStatus.running for step in steps)
+        has_no_running_steps = not await app.DATABASE.any_running_step(
+            task_id=task.task_id, organization_id=task.organization_id
+        )
         if not has_no_running_steps:
             reasons.append(f"another_step_is_running_for_task:{task.task_id}")
 
@@ -95,10 +115,10 @@ class ForgeAgent(Agent):
 
     async def create_task_and_step_from_block(
         self,
-        task_block: TaskBlock,
-        workflow: Workflow,
-        workflow_run: WorkflowRun,
-        workflow_run_context: WorkflowRunContext,
+        task_block: "TaskBlock",
+        workflow: "Workflow",
+        workflow_run: "WorkflowRun",
+        workflow_run_context: "WorkflowRunContext",
         task_order: int,
         task_retry: int,
     ) -> tuple[Task, Step]:
@@ -133,6 +153,8 @@ class ForgeAgent(Agent):
             order=task_order,
             retry=task_retry,
             error_code_mapping=task_block.error_code_mapping,
+            # Workflow tasks start running right away, create them as running instead of updating the status
+            initial_status=TaskStatus.running,
         )
         LOG.info(
             "Created new task for workflow run",
@@ -148,10 +170,6 @@ class ForgeAgent(Agent):
             task_order=task_order,
             task_retry=task_retry,
         )
-        # Update task status to running
-        task = await app.DATABASE.update_task(
-            task_id=task.task_id, organization_id=task.organization_id, status=TaskStatus.running
-        )
         step = await app.DATABASE.create_step(
             task.task_id,
             order=0,
@@ -199,104 +217,84 @@ class ForgeAgent(Agent):
         task: Task,
         step: Step,
         api_key: str | None = None,
-        workflow_run: WorkflowRun | None = None,
+        workflow_run: "WorkflowRun | None" = None,
         close_browser_on_completion: bool = True,
     ) -> Tuple[Step, DetailedAgentStepOutput | None, Step | None]:
-        next_step: Step | None = None
-        detailed_output: DetailedAgentStepOutput | None = None
-        try:
-            # Check some conditions before executing the step, throw an exception if the step can't be executed
-            await self.validate_step_execution(task, step)
-            step, browser_state, detailed_output = await self._initialize_execution_state(task, step, workflow_run)
-            step, detailed_output = await self.agent_step(task, step, browser_state, organization=organization)
-            task = await self.update_task_errors_from_detailed_output(task, detailed_output)
-            retry = False
-
-            # If the step failed, mark the step as failed and retry
-            if step.status == StepStatus.failed:
-                maybe_next_step = await self.handle_failed_step(task, step)
-                # If there is no next step, it means that the task has failed
-                if maybe_next_step:
-                    next_step = maybe_next_step
-                    retry = True
-                else:
-                    await self.send_task_response(
-                        task=task,
-                        last_step=step,
-                        api_key=api_key,
-                        close_browser_on_completion=close_browser_on_completion,
-                    )
-                    return step, detailed_output, None
-            elif step.status == StepStatus.completed:
-                # TODO (kerem): keep the task object uptodate at all times so that send_task_response can just use it
-                is_task_completed, maybe_last_step, maybe_next_step = await self.handle_completed_step(
-                    organization, task, step
-                )
-                if is_task_completed is not None and maybe_last_step:
-                    last_step = maybe_last_step
-                    await self.send_task_response(
-                        task=task,
-                        last_step=last_step,
-                        api_key=api_key,
-                        close_browser_on_completion=close_browser_on_completion,
+        settings = SettingsManager.get_settings()
+        # Steps are executed iteratively: retries and follow-up steps continue the loop instead of recursing
+        while True:
+            next_step: Step | None = None
+            detailed_output: DetailedAgentStepOutput | None = None
+            # Attach the step to every log record emitted while executing it, including the ones from the callees
+            bind_contextvars(
+                task_id=task.task_id, step_id=step.step_id, step_order=step.order, step_retry=step.retry_index
+            )
+            try:
+                # Check some conditions before executing the step, throw an exception if the step can't be executed
+                await self.validate_step_execution(task, step)
+                step, browser_state, detailed_output = await self._initialize_execution_state(task, step, workflow_run)
+                step, detailed_output = await self.agent_step(task, step, browser_state, organization=organization)
+                task = await self.update_task_errors_from_detailed_output(task, detailed_output)
+                retry = False
+
+                # If the step failed, mark the step as failed and retry
+                if step.status == StepStatus.failed:
+                    maybe_next_step, task = await self.handle_failed_step(task, step)
+                    # If there is no next step, it means that the task has failed
+                    if maybe_next_step:
+                        next_step = maybe_next_step
+                        retry = True
+                    else:
+                        await self.send_task_response(
+                            task=task,
+                            last_step=step,
+                            api_key=api_key,
+                            close_browser_on_completion=close_browser_on_completion,
+                            task_already_fresh=True,
+                        )
+                        return step, detailed_output, None
+                elif step.status == StepStatus.completed:
+                    is_task_completed, maybe_last_step, maybe_next_step, task = await self.handle_completed_step(
+                        organization, task, step
                     )
-                    return last_step, detailed_output, None
-                elif maybe_next_step:
-                    next_step = maybe_next_step
-                    retry = False
+                    if is_task_completed is not None and maybe_last_step:
+                        last_step = maybe_last_step
+                        await self.send_task_response(
+                            task=task,
+                            last_step=last_step,
+                            api_key=api_key,
+                            close_browser_on_completion=close_browser_on_completion,
+                            task_already_fresh=True,
+                        )
+                        return last_step, detailed_output, None
+                    elif maybe_next_step:
+                        next_step = maybe_next_step
+                        retry = False
+                    else:
+                        LOG.error(
+                            "Step completed but task is not completed and next step is not created.",
+                            is_task_completed=is_task_completed,
+                            maybe_last_step=maybe_last_step,
+                            maybe_next_step=maybe_next_step,
+                        )
                 else:
-                    LOG.error(
-                        "Step completed but task is not completed and next step is not created.",
-                        task_id=task.task_id,
-                        step_id=step.step_id,
-                        is_task_completed=is_task_completed,
-                        maybe_last_step=maybe_last_step,
-                        maybe_next_step=maybe_next_step,
-                    )
-            else:
-                LOG.error(
-                    "Unexpected step status after agent_step",
-                    task_id=task.task_id,
-                    step_id=step.step_id,
-                    step_status=step.status,
-                )
+                    LOG.error("Unexpected step status after agent_step", step_status=step.status)
+
+                execute_all_steps = settings.execute_all_steps()
+                if next_step and (retry or execute_all_steps):
+                    step = next_step
+                    continue
 
-            if retry and next_step:
-                return await self.execute_step(
-                    organization,
-                    task,
-                    next_step,
-                    api_key=api_key,
-                )
-            elif SettingsManager.get_settings().execute_all_steps() and next_step:
-                return await self.execute_step(
-                    organization,
-                    task,
-                    next_step,
-                    api_key=api_key,
-                )
-            else:
                 LOG.info(
                     "Step executed but continuous execution is disabled.",
-                    task_id=task.task_id,
-                    step_id=step.step_id,
-                    is_cloud_env=SettingsManager.get_settings().is_cloud_environment(),
-                    execute_all_steps=SettingsManager.get_settings().execute_all_steps(),
+                    is_cloud_env=settings.is_cloud_environment(),
+                    execute_all_steps=execute_all_steps,
                     next_step_id=next_step.step_id if next_step else None,
                 )
 
-            return step, detailed_output, next_step
-        # TODO (kerem): Let's add other exceptions that we know about here as custom exceptions as well
-        except FailedToSendWebhook:
-            LOG.exception(
-                "Failed to send webhook",
-                exc_info=True,
-                task_id=task.task_id,
-                step_id=step.step_id,
-                task=task,
-                step=step,
-            )
-            return step, detailed_output, next_step
+                return step, detailed_output, next_step
+            finally:
+                unbind_contextvars("task_id", "step_id", "step_order", "step_retry")
 
     async def agent_step(
         self,
@@ -314,14 +312,9 @@ class ForgeAgent(Agent):
             actions_and_results=None,
         )
         try:
-            LOG.info(
-                "Starting agent step",
-                task_id=task.task_id,
-                step_id=step.step_id,
-                step_order=step.order,
-                step_retry=step.retry_index,
-            )
-            step = await self.update_step(step=step, status=StepStatus.running)
+            LOG.info("Starting agent step")
+            # Nothing reads the running status before the step finishes, don't wait for the db write
+            step = await self.update_step_status_in_background(step=step, status=StepStatus.running)
             scraped_page, extract_action_prompt = await self._build_and_record_step_prompt(
                 task,
                 step,
@@ -339,7 +332,8 @@ class ForgeAgent(Agent):
                 )
                 detailed_agent_step_output.llm_response = json_response
 
-                actions = parse_actions(task, json_response["actions"])
+                # duplicate actions on the same element are dropped while parsing
+                actions, _ = parse_actions(task, json_response["actions"])
             else:
                 actions = [
                     CompleteAction(
@@ -348,13 +342,8 @@ class ForgeAgent(Agent):
                 ]
             detailed_agent_step_output.actions = actions
             if len(actions) == 0:
-                LOG.info(
-                    "No actions to execute, marking step as failed",
-                    task_id=task.task_id,
-                    step_id=step.step_id,
-                    step_order=step.order,
-                    step_retry=step.retry_index,
-                )
+                LOG.info("No actions to execute, marking step as failed")
+                await app.ARTIFACT_MANAGER.wait_for_create_artifact_aiotasks_for_step(step.step_id)
                 step = await self.update_step(
                     step=step, status=StepStatus.failed, output=detailed_agent_step_output.to_agent_step_output()
                 )
@@ -369,14 +358,7 @@ class ForgeAgent(Agent):
                 return step, detailed_agent_step_output
 
             # Execute the actions
-            LOG.info(
-                "Executing actions",
-                task_id=task.task_id,
-                step_id=step.step_id,
-                step_order=step.order,
-                step_retry=step.retry_index,
-                actions=actions,
-            )
+            LOG.info("Executing actions", actions=actions)
             action_results: list[ActionResult] = []
             detailed_agent_step_output.action_results = action_results
             # filter out wait action if there are other actions in the list
@@ -384,30 +366,32 @@ class ForgeAgent(Agent):
             # which will block following actions if we don't remove it from the list
             # if the list only contains WAIT action, we will execute WAIT action(s)
             if len(actions) > 1:
-                wait_actions_to_skip = [action for action in actions if action.action_type == ActionType.WAIT]
-                wait_actions_len = len(wait_actions_to_skip)
+                non_wait_actions = [action for action in actions if action.action_type != ActionType.WAIT]
                 # if there are wait actions and there are other actions in the list, skip wait actions
-                if wait_actions_len > 0 and wait_actions_len < len(actions):
-                    actions = [action for action in actions if action.action_type != ActionType.WAIT]
-                    LOG.info("Skipping wait actions", wait_actions_to_skip=wait_actions_to_skip, actions=actions)
+                if non_wait_actions and len(non_wait_actions) < len(actions):
+                    LOG.info(
+                        "Skipping wait actions",
+                        skipped_wait_actions=len(actions) - len(non_wait_actions),
+                        actions=non_wait_actions,
+                    )
+                    actions = non_wait_actions
 
             # initialize list of tuples and set actions as the first element of each tuple so that in the case
             # of an exception, we can still see all the actions
             detailed_agent_step_output.actions_and_results = [(action, []) for action in actions]
 
-            web_action_element_ids = set()
+            action_jitter_range = SettingsManager.get_settings().ACTION_JITTER_RANGE
             for action_idx, action in enumerate(actions):
-                if isinstance(action, WebAction):
-                    if action.element_id in web_action_element_ids:
-                        LOG.error("Duplicate action element id. Action handling stops", action=action)
-                        break
-                    web_action_element_ids.add(action.element_id)
-
                 results = await ActionHandler.handle_action(scraped_page, task, step, browser_state, action)
                 detailed_agent_step_output.actions_and_results[action_idx] = (action, results)
-                # wait random time between actions to avoid detection
-                await asyncio.sleep(random.uniform(1.0, 2.0))
-                await self.record_artifacts_after_action(task, step, browser_state)
+                # wait random time between actions to avoid detection, record the artifacts in the meantime
+                if action_jitter_range:
+                    await asyncio.gather(
+                        asyncio.sleep(random.uniform(*action_jitter_range)),
+                        self.record_artifacts_after_action(task, step, browser_state),
+                    )
+                else:
+                    await self.record_artifacts_after_action(task, step, browser_state)
                 for result in results:
                     result.step_retry_number = step.retry_index
                     result.step_order = step.order
@@ -416,10 +400,6 @@ class ForgeAgent(Agent):
                 if results and results[-1].success:
                     LOG.info(
                         "Action succeeded",
-                        task_id=task.task_id,
-                        step_id=step.step_id,
-                        step_order=step.order,
-                        step_retry=step.retry_index,
                         action_idx=action_idx,
                         action=action,
                         action_result=results,
@@ -435,97 +415,111 @@ class ForgeAgent(Agent):
                 else:
                     LOG.warning(
                         "Action failed, marking step as failed",
-                        task_id=task.task_id,
-                        step_id=step.step_id,
-                        step_order=step.order,
-                        step_retry=step.retry_index,
                         action_idx=action_idx,
                         action=action,
                         action_result=results,
                         actions_and_results=detailed_agent_step_output.actions_and_results,
                     )
                     # if the action failed, don't execute the rest of the actions, mark the step as failed, and retry
+                    await self.record_final_artifacts(task, step, browser_state)
+                    await app.ARTIFACT_MANAGER.wait_for_create_artifact_aiotasks_for_step(step.step_id)
                     failed_step = await self.update_step(
                         step=step, status=StepStatus.failed, output=detailed_agent_step_output.to_agent_step_output()
                     )
                     return failed_step, detailed_agent_step_output
 
-            LOG.info(
-                "Actions executed successfully, marking step as completed",
-                task_id=task.task_id,
-                step_id=step.step_id,
-                step_order=step.order,
-                step_retry=step.retry_index,
-                action_results=action_results,
-            )
+            LOG.info("Actions executed successfully, marking step as completed", action_results=action_results)
             # If no action errors return the agent state and output
+            await self.record_final_artifacts(task, step, browser_state)
+            await app.ARTIFACT_MANAGER.wait_for_create_artifact_aiotasks_for_step(step.step_id)
             completed_step = await self.update_step(
                 step=step, status=StepStatus.completed, output=detailed_agent_step_output.to_agent_step_output()
             )
             return completed_step, detailed_agent_step_output
         except Exception:
-            LOG.exception(
-                "Unexpected exception in agent_step, marking step as failed",
-                task_id=task.task_id,
-                step_id=step.step_id,
-                step_order=step.order,
-                step_retry=step.retry_index,
-            )
+            LOG.exception("Unexpected exception in agent_step, marking step as failed")
+            await app.ARTIFACT_MANAGER.wait_for_create_artifact_aiotasks_for_step(step.step_id)
             failed_step = await self.update_step(
                 step=step, status=StepStatus.failed, output=detailed_agent_step_output.to_agent_step_output()
             )
             return failed_step, detailed_agent_step_output
 
     async def record_artifacts_after_action(self, task: Task, step: Step, browser_state: BrowserState) -> None:
+        screenshot_mode = SettingsManager.get_settings().SCREENSHOT_AFTER_ACTION_MODE
+        if screenshot_mode == "final_only":
+            # recorded once per step by record_final_artifacts
+            return
+        await self._record_artifacts(task, step, browser_state, screenshot_mode)
+
+    async def record_final_artifacts(self, task: Task, step: Step, browser_state: BrowserState) -> None:
+        """
+        Record the after action artifacts once after all the actions of the step are executed. This is a no-op unless
+        SCREENSHOT_AFTER_ACTION_MODE is "final_only".
+        """
+        if SettingsManager.get_settings().SCREENSHOT_AFTER_ACTION_MODE != "final_only":
+            return
+        await self._record_artifacts(task, step, browser_state, "viewport")
+
+    @staticmethod
+    async def _take_action_screenshot(browser_state: BrowserState, screenshot_mode: str) -> bytes | None:
+        if screenshot_mode == "off":
+            return None
+        return await browser_state.take_screenshot(
+            full_page=screenshot_mode == "full_page",
+            image_type="jpeg",
+            quality=SettingsManager.get_settings().SCREENSHOT_AFTER_ACTION_QUALITY,
+        )
+
+    async def _record_artifacts(
+        self, task: Task, step: Step, browser_state: BrowserState, screenshot_mode: str
+    ) -> None:
         if not browser_state.page:
             raise BrowserStateMissingPage()
-        try:
-            screenshot = await browser_state.take_screenshot(full_page=True)
-            await app.ARTIFACT_MANAGER.create_artifact(
-                step=step,
-                artifact_type=ArtifactType.SCREENSHOT_ACTION,
-                data=screenshot,
-            )
-        except Exception:
-            LOG.error(
-                "Failed to record screenshot after action",
-                task_id=task.task_id,
-                step_id=step.step_id,
-                exc_info=True,
-            )
+        # The captures are independent of each other, run them concurrently and handle the failures one by one
+        screenshot: bytes | None | BaseException
+        html: str | BaseException
+        video_data: bytes | BaseException
+        screenshot, html, video_data = await asyncio.gather(
+            self._take_action_screenshot(browser_state, screenshot_mode),
+            browser_state.page.content(),
+            app.BROWSER_MANAGER.get_video_data(task_id=task.task_id, browser_state=browser_state),
+            return_exceptions=True,
+        )
+        artifacts: list[tuple[Step, ArtifactType, bytes]] = []
+        if isinstance(screenshot, BaseException):
+            LOG.error("Failed to record screenshot after action", exc_info=screenshot)
+        elif screenshot is not None:
+            artifacts.append((step, ArtifactType.SCREENSHOT_ACTION, screenshot))
 
-        try:
-            html = await browser_state.page.content()
-            await app.ARTIFACT_MANAGER.create_artifact(
-                step=step,
-                artifact_type=ArtifactType.HTML_ACTION,
-                data=html.encode(),
-            )
-        except Exception:
-            LOG.error(
-                "Failed to record html after action",
-                task_id=task.task_id,
-                step_id=step.step_id,
-                exc_info=True,
-            )
+        if isinstance(html, BaseException):
+            LOG.error("Failed to record html after action", exc_info=html)
+        else:
+            artifacts.append((step, ArtifactType.HTML_ACTION, html.encode()))
+
+        if artifacts:
+            try:
+                await app.ARTIFACT_MANAGER.create_artifacts_bulk(artifacts)
+            except Exception:
+                LOG.error(
+                    "Failed to record artifacts after action",
+                    artifact_types=[artifact_type for _, artifact_type, _ in artifacts],
+                    exc_info=True,
+                )
 
+        if isinstance(video_data, BaseException):
+            LOG.error("Failed to record video after action", exc_info=video_data)
+            return
         try:
-            video_data = await app.BROWSER_MANAGER.get_video_data(task_id=task.task_id, browser_state=browser_state)
             await app.ARTIFACT_MANAGER.update_artifact_data(
                 artifact_id=browser_state.browser_artifacts.video_artifact_id,
                 organization_id=task.organization_id,
                 data=video_data,
             )
         except Exception:
-            LOG.error(
-                "Failed to record video after action",
-                task_id=task.task_id,
-                step_id=step.step_id,
-                exc_info=True,
-            )
+            LOG.error("Failed to record video after action", exc_info=True)
 
     async def _initialize_execution_state(
-        self, task: Task, step: Step, workflow_run: WorkflowRun | None = None
+        self, task: Task, step: Step, workflow_run: "WorkflowRun | None" = None
     ) -> tuple[Step, BrowserState, DetailedAgentStepOutput]:
         if workflow_run:
             browser_state = await app.BROWSER_MANAGER.get_or_create_for_workflow_run(
@@ -564,56 +558,63 @@ class ForgeAgent(Agent):
             browser_state,
             task.url,
         )
-        await app.ARTIFACT_MANAGER.create_artifact(
+        # The artifacts aren't needed for the LLM call, create them in the background. agent_step waits for them
+        # before marking the step as completed or failed.
+        app.ARTIFACT_MANAGER.create_artifact_in_background(
             step=step,
             artifact_type=ArtifactType.HTML_SCRAPE,
-            data=scraped_page.html.encode(),
+            data=scraped_page.html_bytes,
         )
-        LOG.info(
-            "Scraped website",
+        LOG.info("Scraped website", num_elements=len(scraped_page.elements), url=task.url)
+        # Get action results from the last app.SETTINGS.PROMPT_ACTION_HISTORY_WINDOW steps
+        window_step_action_results = await app.DATABASE.get_recent_step_action_results(
             task_id=task.task_id,
-            step_id=step.step_id,
-            step_order=step.order,
-            step_retry=step.retry_index,
-            num_elements=len(scraped_page.elements),
-            url=task.url,
+            organization_id=task.organization_id,
+            limit=SettingsManager.get_settings().PROMPT_ACTION_HISTORY_WINDOW,
         )
-        # Get action results from the last app.SETTINGS.PROMPT_ACTION_HISTORY_WINDOW steps
-        steps = await app.DATABASE.get_task_steps(task_id=task.task_id, organization_id=task.organization_id)
-        window_steps = steps[-1 * SettingsManager.get_settings().PROMPT_ACTION_HISTORY_WINDOW :]
-        action_results: list[ActionResult] = []
-        for window_step in window_steps:
-            if window_step.output and window_step.output.action_results:
-                action_results.extend(window_step.output.action_results)
-        action_results_str = json.dumps([action_result.model_dump() for action_result in action_results])
+        # Completed steps don't change, so each step's action results are serialized only once
+        action_results_fragments: list[str] = []
+        for step_id, modified_at, step_action_results in window_step_action_results:
+            cache_key = (step_id, modified_at)
+            action_results_fragment = STEP_ACTION_RESULTS_JSON_CACHE.get(cache_key)
+            if action_results_fragment is None:
+                action_results_fragment = ",".join(
+                    ActionResult.model_validate(action_result).model_dump_json()
+                    for action_result in step_action_results or []
+                )
+                STEP_ACTION_RESULTS_JSON_CACHE[cache_key] = action_results_fragment
+            if action_results_fragment:
+                action_results_fragments.append(action_results_fragment)
+        action_results_str = "[" + ",".join(action_results_fragments) + "]"
         # Generate the extract action prompt
         navigation_goal = task.navigation_goal
         extract_action_prompt = prompt_engine.load_prompt(
             "extract-action",
             navigation_goal=navigation_goal,
-            navigation_payload_str=json.dumps(task.navigation_payload),
+            navigation_payload_str=orjson.dumps(task.navigation_payload).decode(),
             url=task.url,
             elements=scraped_page.element_tree_trimmed,  # scraped_page.element_tree,
             data_extraction_goal=task.data_extraction_goal,
             action_history=action_results_str,
-            error_code_mapping_str=json.dumps(task.error_code_mapping) if task.error_code_mapping else None,
+            error_code_mapping_str=orjson.dumps(task.error_code_mapping).decode() if task.error_code_mapping else None,
             utc_datetime=datetime.utcnow(),
         )
 
-        await app.ARTIFACT_MANAGER.create_artifact(
+        app.ARTIFACT_MANAGER.create_artifact_in_background(
             step=step,
             artifact_type=ArtifactType.VISIBLE_ELEMENTS_ID_XPATH_MAP,
-            data=json.dumps(scraped_page.id_to_xpath_dict, indent=2).encode(),
-        )
-        await app.ARTIFACT_MANAGER.create_artifact(
-            step=step,
-            artifact_type=ArtifactType.VISIBLE_ELEMENTS_TREE,
-            data=json.dumps(scraped_page.element_tree, indent=2).encode(),
+            data=scraped_page.id_to_xpath_json,
         )
-        await app.ARTIFACT_MANAGER.create_artifact(
+        if SettingsManager.get_settings().STORE_FULL_ELEMENT_TREE:
+            app.ARTIFACT_MANAGER.create_artifact_in_background(
+                step=step,
+                artifact_type=ArtifactType.VISIBLE_ELEMENTS_TREE,
+                data=scraped_page.element_tree_json,
+            )
+        app.ARTIFACT_MANAGER.create_artifact_in_background(
             step=step,
             artifact_type=ArtifactType.VISIBLE_ELEMENTS_TREE_TRIMMED,
-            data=json.dumps(scraped_page.element_tree_trimmed, indent=2).encode(),
+            data=scraped_page.element_tree_trimmed_json,
         )
 
         return scraped_page, extract_action_prompt
@@ -622,15 +623,13 @@ class ForgeAgent(Agent):
         """
         Find the last successful ScrapeAction for the task and return the extracted information.
         """
-        steps = await app.DATABASE.get_task_steps(
+        step = await app.DATABASE.find_latest_step_with_action(
             task_id=task.task_id,
+            action_type=ActionType.COMPLETE,
             organization_id=task.organization_id,
+            require_success=True,
         )
-        for step in reversed(steps):
-            if step.status != StepStatus.completed:
-                continue
-            if not step.output or not step.output.actions_and_results:
-                continue
+        if step and step.output and step.output.actions_and_results:
             for action, action_results in step.output.actions_and_results:
                 if action.action_type != ActionType.COMPLETE:
                     continue
@@ -656,20 +655,15 @@ class ForgeAgent(Agent):
         Find the TerminateAction for the task and return the reasoning.
         # TODO (kerem): Also return meaningful exceptions when we add them [WYV-311]
         """
-        steps = await app.DATABASE.get_task_steps(
+        step = await app.DATABASE.find_latest_step_with_action(
             task_id=task.task_id,
+            action_type=ActionType.TERMINATE,
             organization_id=task.organization_id,
         )
-        for step in reversed(steps):
-            if step.status != StepStatus.completed:
-                continue
-            if not step.output:
-                continue
-
-            if step.output.actions_and_results:
-                for action, action_results in step.output.actions_and_results:
-                    if action.action_type == ActionType.TERMINATE:
-                        return action.reasoning
+        if step and step.output and step.output.actions_and_results:
+            for action, action_results in step.output.actions_and_results:
+                if action.action_type == ActionType.TERMINATE:
+                    return action.reasoning
 
         LOG.error(
             "Failed to find failure reasoning for task",
@@ -683,28 +677,47 @@ class ForgeAgent(Agent):
         last_step: Step,
         api_key: str | None = None,
         close_browser_on_completion: bool = True,
+        task_already_fresh: bool = False,
     ) -> None:
         """
         send the task response to the webhook callback url
+        :param task_already_fresh: The task was just returned by update_task, so it isn't refreshed from the db
         """
-        # refresh the task from the db to get the latest status
-        try:
-            refreshed_task = await app.DATABASE.get_task(task_id=task.task_id, organization_id=task.organization_id)
-            if not refreshed_task:
-                LOG.error("Failed to get task from db when sending task response")
-                raise TaskNotFound(task_id=task.task_id)
-        except Exception as e:
-            LOG.error("Failed to get task from db when sending task response", task_id=task.task_id, error=e)
-            raise TaskNotFound(task_id=task.task_id) from e
-        task = refreshed_task
+
+        async def refresh_task() -> Task:
+            # refresh the task from the db to get the latest status
+            try:
+                refreshed_task = await app.DATABASE.get_task(task_id=task.task_id, organization_id=task.organization_id)
+                if not refreshed_task:
+                    LOG.error("Failed to get task from db when sending task response")
+                    raise TaskNotFound(task_id=task.task_id)
+            except Exception as e:
+                LOG.error("Failed to get task from db when sending task response", task_id=task.task_id, error=e)
+                raise TaskNotFound(task_id=task.task_id) from e
+            return refreshed_task
+
+        async def get_browser_state() -> BrowserState:
+            browser_state = await app.BROWSER_MANAGER.get_or_create_for_task(task)
+            await browser_state.get_or_create_page()
+            return browser_state
+
+        if task_already_fresh:
+            browser_state = await get_browser_state()
+        else:
+            # the db round-trip overlaps with getting the page of the browser
+            task, browser_state = await asyncio.gather(refresh_task(), get_browser_state())
         # log the task status as an event
         analytics.capture("skyvern-oss-agent-task-status", {"status": task.status})
         # Take one last screenshot and create an artifact before closing the browser to see the final state
-        browser_state: BrowserState = await app.BROWSER_MANAGER.get_or_create_for_task(task)
-        await browser_state.get_or_create_page()
         try:
-            screenshot = await browser_state.take_screenshot(full_page=True)
-            await app.ARTIFACT_MANAGER.create_artifact(
+            settings = SettingsManager.get_settings()
+            screenshot = await browser_state.take_screenshot(
+                full_page=True,
+                image_type=settings.FINAL_SCREENSHOT_FORMAT,
+                quality=settings.FINAL_SCREENSHOT_QUALITY if settings.FINAL_SCREENSHOT_FORMAT == "jpeg" else None,
+            )
+            # the artifact is created while the browser is cleaned up, it's waited for before the upload tasks
+            app.ARTIFACT_MANAGER.create_artifact_in_background(
                 step=last_step,
                 artifact_type=ArtifactType.SCREENSHOT_FINAL,
                 data=screenshot,
@@ -723,16 +736,23 @@ class ForgeAgent(Agent):
                 task_id=task.task_id,
                 workflow_run_id=task.workflow_run_id,
             )
+            await app.ARTIFACT_MANAGER.wait_for_create_artifact_aiotasks_for_step(last_step.step_id)
             return
 
         await self.cleanup_browser_and_create_artifacts(close_browser_on_completion, last_step, task)
 
         # Wait for all tasks to complete before generating the links for the artifacts
+        await app.ARTIFACT_MANAGER.wait_for_create_artifact_aiotasks_for_step(last_step.step_id)
         await app.ARTIFACT_MANAGER.wait_for_upload_aiotasks_for_task(task.task_id)
 
-        await self.execute_task_webhook(task=task, last_step=last_step, api_key=api_key)
+        # The webhook is sent in the background, the task is already finalized in the db
+        await app.WEBHOOK_DISPATCHER.put(WebhookJob(task=task, last_step=last_step, api_key=api_key))
 
     async def execute_task_webhook(self, task: Task, last_step: Step, api_key: str | None) -> None:
+        """
+        Send the task response to the webhook callback url of the task.
+        :param task: The task as it is in the db. The callers already refresh it, so it isn't fetched again here.
+        """
         if not api_key:
             LOG.warning(
                 "Request has no api key. Not sending task response",
@@ -747,44 +767,31 @@ class ForgeAgent(Agent):
             )
             return
 
-        # get the artifact of the screenshot and get the screenshot_url
-        screenshot_artifact = await app.DATABASE.get_artifact(
-            task_id=task.task_id,
-            step_id=last_step.step_id,
-            artifact_type=ArtifactType.SCREENSHOT_FINAL,
-            organization_id=task.organization_id,
+        # get the screenshot and recording artifacts, and their share links
+        screenshot_artifact, recording_artifact = await asyncio.gather(
+            app.DATABASE.get_artifact(
+                task_id=task.task_id,
+                step_id=last_step.step_id,
+                artifact_type=ArtifactType.SCREENSHOT_FINAL,
+                organization_id=task.organization_id,
+            ),
+            app.DATABASE.get_artifact(
+                task_id=task.task_id,
+                step_id=last_step.step_id,
+                artifact_type=ArtifactType.RECORDING,
+                organization_id=task.organization_id,
+            ),
         )
-        screenshot_url = None
-        if screenshot_artifact:
-            screenshot_url = await app.ARTIFACT_MANAGER.get_share_link(screenshot_artifact)
-
-        recording_artifact = await app.DATABASE.get_artifact(
-            task_id=task.task_id,
-            step_id=last_step.step_id,
-            artifact_type=ArtifactType.RECORDING,
-            organization_id=task.organization_id,
+        screenshot_url, recording_url = await asyncio.gather(
+            app.ARTIFACT_MANAGER.get_share_link(screenshot_artifact),
+            app.ARTIFACT_MANAGER.get_share_link(recording_artifact),
         )
-        recording_url = None
-        if recording_artifact:
-            recording_url = await app.ARTIFACT_MANAGER.get_share_link(recording_artifact)
-
-        # get the latest task from the db to get the latest status, extracted_information, and failure_reason
-        task_from_db = await app.DATABASE.get_task(task_id=task.task_id, organization_id=task.organization_id)
-        if not task_from_db:
-            LOG.error("Failed to get task from db when sending task response")
-            raise TaskNotFound(task_id=task.task_id)
-
-        task = task_from_db
-        if not task.webhook_callback_url:
-            LOG.info("Task has no webhook callback url. Not sending task response")
-            return
 
         task_response = task.to_task_response(screenshot_url=screenshot_url, recording_url=recording_url)
 
         # send task_response to the webhook callback url
-        # TODO: use async requests (httpx)
         timestamp = str(int(datetime.utcnow().timestamp()))
-        payload = task_response.model_dump_json(exclude={"request": {"navigation_payload"}})
+        payload = TASK_RESPONSE_ADAPTER.dump_json(task_response, exclude={"request": {"navigation_payload"}})
         signature = generate_skyvern_signature(
             payload=payload,
             api_key=api_key,
@@ -798,17 +805,17 @@ class ForgeAgent(Agent):
             "Sending task response to webhook callback url",
             task_id=task.task_id,
             webhook_callback_url=task.webhook_callback_url,
-            payload=payload,
+            payload_size=len(payload),
             headers=headers,
         )
+        log_webhook_payload(payload, task_id=task.task_id)
         try:
-            resp = requests.post(task.webhook_callback_url, data=payload, headers=headers)
-            if resp.ok:
+            resp = await post_webhook(task.webhook_callback_url, payload=payload, headers=headers)
+            if resp.is_success:
                 LOG.info(
                     "Webhook sent successfully",
                     task_id=task.task_id,
                     resp_code=resp.status_code,
-                    resp_text=resp.text,
                 )
             else:
                 LOG.info(
@@ -816,7 +823,6 @@ class ForgeAgent(Agent):
                     task_id=task.task_id,
                     resp=resp,
                     resp_code=resp.status_code,
-                    resp_json=resp.json(),
                     resp_text=resp.text,
                 )
         except Exception as e:
@@ -828,30 +834,41 @@ class ForgeAgent(Agent):
         # We need to close the browser even if there is no webhook callback url or api key
         browser_state = await app.BROWSER_MANAGER.cleanup_for_task(task.task_id, close_browser_on_completion)
         if browser_state:
-            # Update recording artifact after closing the browser, so we can get an accurate recording
-            video_data = await app.BROWSER_MANAGER.get_video_data(task_id=task.task_id, browser_state=browser_state)
-            if video_data:
-                await app.ARTIFACT_MANAGER.update_artifact_data(
-                    artifact_id=browser_state.browser_artifacts.video_artifact_id,
-                    organization_id=task.organization_id,
-                    data=video_data,
-                )
 
-            har_data = await app.BROWSER_MANAGER.get_har_data(task_id=task.task_id, browser_state=browser_state)
-            if har_data:
-                await app.ARTIFACT_MANAGER.create_artifact(
-                    step=last_step,
-                    artifact_type=ArtifactType.HAR,
-                    data=har_data,
-                )
+            async def update_video_artifact(browser_state: BrowserState) -> None:
+                # Update recording artifact after closing the browser, so we can get an accurate recording
+                video_data = await app.BROWSER_MANAGER.get_video_data(task_id=task.task_id, browser_state=browser_state)
+                if video_data:
+                    await app.ARTIFACT_MANAGER.update_artifact_data(
+                        artifact_id=browser_state.browser_artifacts.video_artifact_id,
+                        organization_id=task.organization_id,
+                        data=video_data,
+                    )
 
-            if browser_state.browser_context and browser_state.browser_artifacts.traces_dir:
-                trace_path = f"{browser_state.browser_artifacts.traces_dir}/{task.task_id}.zip"
-                await app.ARTIFACT_MANAGER.create_artifact(
-                    step=last_step,
-                    artifact_type=ArtifactType.TRACE,
-                    path=trace_path,
-                )
+            async def create_har_artifact(browser_state: BrowserState) -> None:
+                har_data = await app.BROWSER_MANAGER.get_har_data(task_id=task.task_id, browser_state=browser_state)
+                if har_data:
+                    await app.ARTIFACT_MANAGER.create_artifact(
+                        step=last_step,
+                        artifact_type=ArtifactType.HAR,
+                        data=har_data,
+                    )
+
+            async def create_trace_artifact(browser_state: BrowserState) -> None:
+                if browser_state.browser_context and browser_state.browser_artifacts.traces_dir:
+                    trace_path = f"{browser_state.browser_artifacts.traces_dir}/{task.task_id}.zip"
+                    await app.ARTIFACT_MANAGER.create_artifact(
+                        step=last_step,
+                        artifact_type=ArtifactType.TRACE,
+                        path=trace_path,
+                    )
+
+            # the video, har and trace artifacts are independent of each other
+            await asyncio.gather(
+                update_video_artifact(browser_state),
+                create_har_artifact(browser_state),
+                create_trace_artifact(browser_state),
+            )
         else:
             LOG.warning(
                 "BrowserState is missing before sending response to webhook_callback_url",
@@ -876,17 +893,14 @@ class ForgeAgent(Agent):
             updates["is_last"] = is_last
         if retry_index is not None:
             updates["retry_index"] = retry_index
-        update_comparison = {
-            key: {"old": getattr(step, key), "new": value}
-            for key, value in updates.items()
-            if getattr(step, key) != value
-        }
-        LOG.info(
-            "Updating step in db",
-            task_id=step.task_id,
-            step_id=step.step_id,
-            diff=update_comparison,
-        )
+        # the diff is only for the log, skip it when info logs are dropped
+        if is_log_level_enabled(logging.INFO):
+            LOG.info(
+                "Updating step in db",
+                task_id=step.task_id,
+                step_id=step.step_id,
+                diff=build_update_diff(step, updates),
+            )
         return await app.DATABASE.update_step(
             task_id=step.task_id,
             step_id=step.step_id,
@@ -894,6 +908,21 @@ class ForgeAgent(Agent):
             **updates,
         )
 
+    async def update_step_status_in_background(self, step: Step, status: StepStatus) -> Step:
+        """
+        Write-behind version of update_step for the status transitions that don't have to be persisted before moving
+        on. Returns the step with the new status without waiting for the db write.
+        """
+        step.validate_update(status, None, None)
+        LOG.info(
+            "Queueing step status update",
+            task_id=step.task_id,
+            step_id=step.step_id,
+            diff={"status": {"old": step.status, "new": status}},
+        )
+        await app.DATABASE.enqueue_step_update(step_id=step.step_id, status=status)
+        return step.model_copy(update={"status": status})
+
     async def update_task(
         self,
         task: Task,
@@ -909,34 +938,34 @@ class ForgeAgent(Agent):
             updates["extracted_information"] = extracted_information
         if failure_reason is not None:
             updates["failure_reason"] = failure_reason
-        update_comparison = {
-            key: {"old": getattr(task, key), "new": value}
-            for key, value in updates.items()
-            if getattr(task, key) != value
-        }
-        LOG.info("Updating task in db", task_id=task.task_id, diff=update_comparison)
+        if is_log_level_enabled(logging.INFO):
+            LOG.info("Updating task in db", task_id=task.task_id, diff=build_update_diff(task, updates))
         return await app.DATABASE.update_task(
             task.task_id,
             organization_id=task.organization_id,
             **updates,
         )
 
-    async def handle_failed_step(self, task: Task, step: Step) -> Step | None:
-        if step.retry_index >= SettingsManager.get_settings().MAX_RETRIES_PER_STEP:
+    async def handle_failed_step(self, task: Task, step: Step) -> tuple[Step | None, Task]:
+        """
+        :return: The retry step, or None if the task failed, and the task as it is in the db
+        """
+        max_retries_per_step = SettingsManager.get_settings().MAX_RETRIES_PER_STEP
+        if step.retry_index >= max_retries_per_step:
             LOG.warning(
                 "Step failed after max retries, marking task as failed",
                 task_id=task.task_id,
                 step_id=step.step_id,
                 step_order=step.order,
                 step_retry=step.retry_index,
-                max_retries=SettingsManager.get_settings().MAX_RETRIES_PER_STEP,
+                max_retries=max_retries_per_step,
             )
-            await self.update_task(
+            task = await self.update_task(
                 task,
                 TaskStatus.failed,
-                failure_reason=f"Max retries per step ({SettingsManager.get_settings().MAX_RETRIES_PER_STEP}) exceeded",
+                failure_reason=f"Max retries per step ({max_retries_per_step}) exceeded",
             )
-            return None
+            return None, task
         else:
             LOG.warning(
                 "Step failed, retrying",
@@ -951,11 +980,15 @@ class ForgeAgent(Agent):
                 order=step.order,
                 retry_index=step.retry_index + 1,
             )
-            return next_step
+            return next_step, task
 
     async def handle_completed_step(
         self, organization: Organization, task: Task, step: Step
-    ) -> tuple[bool | None, Step | None, Step | None]:
+    ) -> tuple[bool | None, Step | None, Step | None, Task]:
+        """
+        :return: Whether the task is completed (None if it continues), the last step, the next step, and the task as it
+        is in the db
+        """
         if step.is_goal_achieved():
             LOG.info(
                 "Step completed and goal achieved, marking task as completed",
@@ -966,9 +999,12 @@ class ForgeAgent(Agent):
                 output=step.output,
             )
             last_step = await self.update_step(step, is_last=True)
+            # Workflow run tasks need this too, the workflow run status and webhook payload include it
             extracted_information = await self.get_extracted_information_for_task(task)
-            await self.update_task(task, status=TaskStatus.completed, extracted_information=extracted_information)
-            return True, last_step, None
+            task = await self.update_task(
+                task, status=TaskStatus.completed, extracted_information=extracted_information
+            )
+            return True, last_step, None, task
         if step.is_terminated():
             LOG.info(
                 "Step completed and terminated by the agent, marking task as terminated",
@@ -979,17 +1015,15 @@ class ForgeAgent(Agent):
                 output=step.output,
             )
             last_step = await self.update_step(step, is_last=True)
+            # Terminated tasks require a failure reason, even when they're part of a workflow run
             failure_reason = await self.get_failure_reason_for_task(task)
-            await self.update_task(task, status=TaskStatus.terminated, failure_reason=failure_reason)
-            return False, last_step, None
+            task = await self.update_task(task, status=TaskStatus.terminated, failure_reason=failure_reason)
+            return False, last_step, None, task
         # If the max steps are exceeded, mark the current step as the last step and conclude the task
+        settings = SettingsManager.get_settings()
         context = skyvern_context.ensure_context()
         override_max_steps_per_run = context.max_steps_override
-        max_steps_per_run = (
-            override_max_steps_per_run
-            or organization.max_steps_per_run
-            or SettingsManager.get_settings().MAX_STEPS_PER_RUN
-        )
+        max_steps_per_run = override_max_steps_per_run or organization.max_steps_per_run or settings.MAX_STEPS_PER_RUN
         if step.order + 1 >= max_steps_per_run:
             LOG.info(
                 "Step completed but max steps reached, marking task as failed",
@@ -1001,12 +1035,12 @@ class ForgeAgent(Agent):
                 max_steps=max_steps_per_run,
             )
             last_step = await self.update_step(step, is_last=True)
-            await self.update_task(
+            task = await self.update_task(
                 task,
                 status=TaskStatus.failed,
                 failure_reason=f"Max steps per task ({max_steps_per_run}) exceeded",
             )
-            return False, last_step, None
+            return False, last_step, None, task
         else:
             LOG.info(
                 "Step completed, creating next step",
@@ -1023,26 +1057,21 @@ class ForgeAgent(Agent):
                 organization_id=task.organization_id,
             )
 
-            if step.order == int(
-                max_steps_per_run * SettingsManager.get_settings().LONG_RUNNING_TASK_WARNING_RATIO - 1
-            ):
+            warning_ratio = settings.LONG_RUNNING_TASK_WARNING_RATIO
+            long_running_warning_order = int(max_steps_per_run * warning_ratio - 1)
+            if step.order == long_running_warning_order:
                 LOG.info(
                     "Long running task warning",
                     order=step.order,
                     max_steps=max_steps_per_run,
-                    warning_ratio=SettingsManager.get_settings().LONG_RUNNING_TASK_WARNING_RATIO,
+                    warning_ratio=warning_ratio,
                 )
-            return None, None, next_step
+            return None, None, next_step, task
 
     @staticmethod
     async def get_task_errors(task: Task) -> list[UserDefinedError]:
-        steps = await app.DATABASE.get_task_steps(task_id=task.task_id, organization_id=task.organization_id)
-        errors = []
-        for step in steps:
-            if step.output and step.output.errors:
-                errors.extend(step.output.errors)
-
-        return errors
+        # update_task_errors_from_detailed_output accumulates the errors of every step on the task
+        return [UserDefinedError.model_validate(error) for error in task.errors]
 
     @staticmethod
     async def update_task_errors_from_detailed_output(
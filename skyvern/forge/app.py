@@ -1,8 +1,10 @@
+import httpx
 from ddtrace import tracer
 from ddtrace.filters import FilterRequestsOnUrl
 
 from skyvern.forge.agent import ForgeAgent
 from skyvern.forge.sdk.api.llm.api_handler_factory import LLMAPIHandlerFactory
+from skyvern.forge.sdk.api.webhook import WebhookDispatcher
 from skyvern.forge.sdk.artifact.manager import ArtifactManager
 from skyvern.forge.sdk.artifact.storage.factory import StorageFactory
 from skyvern.forge.sdk.db.client import AgentDB
@@ -31,6 +33,13 @@ BROWSER_MANAGER = BrowserManager()
 LLM_API_HANDLER = LLMAPIHandlerFactory.get_llm_api_handler(SettingsManager.get_settings().LLM_KEY)
 WORKFLOW_CONTEXT_MANAGER = WorkflowContextManager()
 WORKFLOW_SERVICE = WorkflowService()
+# Shared client for the webhooks so that the connections (and the TLS handshakes) are reused across requests
+HTTP_CLIENT = httpx.AsyncClient(
+    http2=True,
+    timeout=httpx.Timeout(connect=5, read=30, write=10, pool=5),
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+)
+WEBHOOK_DISPATCHER = WebhookDispatcher()
 agent = ForgeAgent()
 
 app = agent.get_agent_app()
@@ -10,6 +10,7 @@ from starlette.requests import HTTPConnection, Request
 from starlette_context.middleware import RawContextMiddleware
 from starlette_context.plugins.base import Plugin
 
+from skyvern.forge import app as forge_app
 from skyvern.forge.sdk.core import skyvern_context
 from skyvern.forge.sdk.core.skyvern_context import SkyvernContext
 from skyvern.forge.sdk.routes.agent_protocol import base_router
@@ -65,6 +66,12 @@ class Agent:
             LOG.info("Starting the skyvern scheduler.")
             SCHEDULER.start()
 
+        @app.on_event("shutdown")
+        async def close_http_client() -> None:
+            # Let the queued webhooks go out and stop the dispatcher before closing the client
+            await forge_app.WEBHOOK_DISPATCHER.shutdown(timeout=30)
+            await forge_app.HTTP_CLIENT.aclose()
+
         @app.exception_handler(Exception)
         async def unexpected_exception(request: Request, exc: Exception) -> JSONResponse:
             LOG.exception("Unexpected error in agent server.", exc_info=exc)
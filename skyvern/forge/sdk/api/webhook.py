@@ -0,0 +1,174 @@
+import asyncio
+import contextvars
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import httpx
+import structlog
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception_type,
+    retry_if_result,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+from skyvern.forge import app
+from skyvern.forge.sdk.forge_log import is_log_level_enabled
+from skyvern.forge.sdk.models import Step
+from skyvern.forge.sdk.schemas.tasks import Task
+from skyvern.forge.sdk.settings_manager import SettingsManager
+
+LOG = structlog.get_logger()
+
+
+def is_retryable_response(response: httpx.Response) -> bool:
+    # 4xx responses other than 429 won't succeed on a retry
+    return response.status_code == 429 or response.is_server_error
+
+
+def get_retry_after_seconds(response: httpx.Response) -> float | None:
+    """
+    Parse the Retry-After header, which is either a number of seconds or an HTTP date.
+    """
+    retry_after = response.headers.get("Retry-After")
+    if not retry_after:
+        return None
+    if retry_after.isdigit():
+        return float(retry_after)
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        # parsedate_to_datetime returns a naive datetime for the "-0000" zone, which means UTC
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+def return_last_outcome(retry_state: RetryCallState) -> httpx.Response:
+    """
+    Return the last response (or raise the last error) once the retries are exhausted.
+    """
+    assert retry_state.outcome is not None
+    return retry_state.outcome.result()
+
+
+async def post_webhook(url: str, payload: str | bytes, headers: dict[str, str]) -> httpx.Response:
+    """
+    Send the webhook, retrying with exponential backoff on network errors, 429 and 5xx responses.
+    :return: The response of the last attempt. Raises the network error if the last attempt failed with one.
+    """
+    settings = SettingsManager.get_settings()
+    max_delay = settings.WEBHOOK_MAX_DELAY_MS / 1000
+    exponential_wait = wait_exponential_jitter(initial=settings.WEBHOOK_BASE_DELAY_MS / 1000, max=max_delay)
+
+    def wait(retry_state: RetryCallState) -> float:
+        # honor the Retry-After header of 429 and 503 responses
+        if retry_state.outcome and not retry_state.outcome.failed:
+            retry_after = get_retry_after_seconds(retry_state.outcome.result())
+            if retry_after is not None:
+                return min(retry_after, max_delay)
+        return exponential_wait(retry_state)
+
+    def log_retry(retry_state: RetryCallState) -> None:
+        outcome = retry_state.outcome
+        LOG.warning(
+            "Retrying webhook",
+            webhook_callback_url=url,
+            attempt_number=retry_state.attempt_number,
+            resp_code=outcome.result().status_code if outcome and not outcome.failed else None,
+            exc_info=outcome.exception() if outcome else None,
+        )
+
+    retrying = AsyncRetrying(
+        stop=stop_after_attempt(settings.WEBHOOK_MAX_RETRIES + 1),
+        wait=wait,
+        retry=retry_if_exception_type(httpx.TransportError) | retry_if_result(is_retryable_response),
+        before_sleep=log_retry,
+        retry_error_callback=return_last_outcome,
+    )
+    return await retrying(app.HTTP_CLIENT.post, url, content=payload, headers=headers)
+
+
+def log_webhook_payload(payload: bytes, **kwargs: Any) -> None:
+    """
+    Log the full webhook payload at debug level. The payload can be large, so it's only decoded when the debug logs are
+    kept.
+    """
+    if is_log_level_enabled(logging.DEBUG):
+        LOG.debug("Webhook payload", payload=payload.decode("utf-8", "replace"), **kwargs)
+
+
+@dataclass(frozen=True)
+class WebhookJob:
+    task: Task
+    last_step: Step
+    api_key: str | None
+
+
+class WebhookDispatcher:
+    """
+    Sends the task webhooks in the background, so finishing a task doesn't wait for the webhook endpoint. The jobs are
+    consumed by WEBHOOK_DISPATCHER_CONSUMERS workers that are started with the first job.
+    """
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[WebhookJob] | None = None
+        self.consumers: list[asyncio.Task[None]] = []
+        # consumer -> the job it's sending
+        self.in_flight_jobs: dict[asyncio.Task[None], WebhookJob] = {}
+
+    async def put(self, job: WebhookJob) -> None:
+        if self.queue is None or all(consumer.done() for consumer in self.consumers):
+            self.queue = asyncio.Queue()
+            self.consumers = [
+                # run the consumers in an empty context, so they don't inherit the log context of the first caller
+                asyncio.create_task(self._consume(self.queue), context=contextvars.Context())
+                for _ in range(SettingsManager.get_settings().WEBHOOK_DISPATCHER_CONSUMERS)
+            ]
+        await self.queue.put(job)
+
+    async def shutdown(self, timeout: float) -> None:
+        """
+        Wait for the queued and in-flight jobs to be sent, then stop the consumers. The jobs that aren't sent within
+        the timeout are dropped and their task ids are logged, so the webhooks can be resent with
+        /tasks/{task_id}/retry_webhook.
+        """
+        if self.queue is None:
+            return
+        try:
+            async with asyncio.timeout(timeout):
+                await self.queue.join()
+        except asyncio.TimeoutError:
+            unsent_jobs = list(self.in_flight_jobs.values())
+            while not self.queue.empty():
+                unsent_jobs.append(self.queue.get_nowait())
+            LOG.error(
+                f"Timeout ({timeout}s) while waiting for the webhooks to be sent, dropping the unsent webhooks",
+                unsent_task_ids=[job.task.task_id for job in unsent_jobs],
+            )
+        # cancel the consumers before the http client is closed, so no webhook is sent with a closed client
+        for consumer in self.consumers:
+            consumer.cancel()
+        await asyncio.gather(*self.consumers, return_exceptions=True)
+        self.consumers = []
+        self.queue = None
+
+    async def _consume(self, queue: asyncio.Queue[WebhookJob]) -> None:
+        consumer = asyncio.current_task()
+        assert consumer is not None
+        while True:
+            job = await queue.get()
+            self.in_flight_jobs[consumer] = job
+            try:
+                await app.agent.execute_task_webhook(task=job.task, last_step=job.last_step, api_key=job.api_key)
+            except Exception:
+                LOG.exception("Failed to send webhook", task_id=job.task.task_id, step_id=job.last_step.step_id)
+            finally:
+                del self.in_flight_jobs[consumer]
+                queue.task_done()
@@ -15,6 +15,8 @@ LOG = structlog.get_logger(__name__)
 class ArtifactManager:
     # task_id -> list of aio_tasks for uploading artifacts
     upload_aiotasks_map: dict[str, list[asyncio.Task[None]]] = defaultdict(list)
+    # step_id -> list of aio_tasks for creating artifacts in the background
+    create_artifact_aiotasks_map: dict[str, list[asyncio.Task[str]]] = defaultdict(list)
 
     async def create_artifact(
         self, step: Step, artifact_type: ArtifactType, data: bytes | None = None, path: str | None = None
@@ -55,6 +57,46 @@ class ArtifactManager:
 
         return artifact_id
 
+    def create_artifact_in_background(
+        self, step: Step, artifact_type: ArtifactType, data: bytes | None = None, path: str | None = None
+    ) -> None:
+        """
+        Create the artifact without blocking the caller. Use wait_for_create_artifact_aiotasks_for_step to make sure
+        the artifacts of the step are created.
+        """
+        aio_task = asyncio.create_task(
+            self.create_artifact(step=step, artifact_type=artifact_type, data=data, path=path)
+        )
+        self.create_artifact_aiotasks_map[step.step_id].append(aio_task)
+
+    async def create_artifacts_bulk(self, artifacts: list[tuple[Step, ArtifactType, bytes]]) -> list[str]:
+        """
+        Create multiple artifacts with a single db round-trip and upload their data concurrently.
+        :param artifacts: List of (step, artifact_type, data) tuples
+        :return: The artifact ids in the same order as the input
+        """
+        artifact_params = []
+        for step, artifact_type, _ in artifacts:
+            artifact_id = generate_artifact_id()
+            artifact_params.append(
+                {
+                    "artifact_id": artifact_id,
+                    "step_id": step.step_id,
+                    "task_id": step.task_id,
+                    "artifact_type": artifact_type,
+                    "uri": app.STORAGE.build_uri(artifact_id, step, artifact_type),
+                    "organization_id": step.organization_id,
+                }
+            )
+        created_artifacts = await app.DATABASE.create_artifacts(artifact_params)
+        for artifact, (step, _, data) in zip(created_artifacts, artifacts):
+            if data:
+                # Fire and forget
+                aio_task = asyncio.create_task(app.STORAGE.store_artifact(artifact, data))
+                self.upload_aiotasks_map[step.task_id].append(aio_task)
+
+        return [artifact.artifact_id for artifact in created_artifacts]
+
     async def update_artifact_data(self, artifact_id: str | None, organization_id: str | None, data: bytes) -> None:
         if not artifact_id or not organization_id:
             return None
@@ -68,9 +110,18 @@ class ArtifactManager:
     async def retrieve_artifact(self, artifact: Artifact) -> bytes | None:
         return await app.STORAGE.retrieve_artifact(artifact)
 
-    async def get_share_link(self, artifact: Artifact) -> str | None:
+    async def get_share_link(self, artifact: Artifact | None) -> str | None:
+        if not artifact:
+            return None
         return await app.STORAGE.get_share_link(artifact)
 
+    async def wait_for_create_artifact_aiotasks_for_step(self, step_id: str) -> None:
+        aio_tasks = self.create_artifact_aiotasks_map.pop(step_id, [])
+        results = await asyncio.gather(*aio_tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                LOG.error("Failed to create artifact in the background", step_id=step_id, exc_info=result)
+
     async def wait_for_upload_aiotasks_for_task(self, task_id: str) -> None:
         try:
             st = time.time()
@@ -2,13 +2,13 @@ from abc import ABC, abstractmethod
 
 from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType
 from skyvern.forge.sdk.models import Step
+from skyvern.forge.sdk.settings_manager import SettingsManager
 
 # TODO: This should be a part of the ArtifactType model
 FILE_EXTENTSION_MAP: dict[ArtifactType, str] = {
     ArtifactType.RECORDING: "webm",
     ArtifactType.SCREENSHOT_LLM: "png",
-    ArtifactType.SCREENSHOT_ACTION: "png",
-    ArtifactType.SCREENSHOT_FINAL: "png",
+    ArtifactType.SCREENSHOT_ACTION: "jpg",
     ArtifactType.LLM_PROMPT: "txt",
     ArtifactType.LLM_REQUEST: "json",
     ArtifactType.LLM_RESPONSE: "json",
@@ -23,6 +23,13 @@ FILE_EXTENTSION_MAP: dict[ArtifactType, str] = {
 }
 
 
+def get_file_extension(artifact_type: ArtifactType) -> str:
+    # SCREENSHOT_FINAL isn't in FILE_EXTENTSION_MAP, its extension follows the FINAL_SCREENSHOT_FORMAT setting
+    if artifact_type == ArtifactType.SCREENSHOT_FINAL:
+        return "jpg" if SettingsManager.get_settings().FINAL_SCREENSHOT_FORMAT == "jpeg" else "png"
+    return FILE_EXTENTSION_MAP[artifact_type]
+
+
 class BaseStorage(ABC):
     @abstractmethod
     def build_uri(self, artifact_id: str, step: Step, artifact_type: ArtifactType) -> str:
@@ -5,7 +5,7 @@ from urllib.parse import unquote, urlparse
 import structlog
 
 from skyvern.forge.sdk.artifact.models import Artifact, ArtifactType
-from skyvern.forge.sdk.artifact.storage.base import FILE_EXTENTSION_MAP, BaseStorage
+from skyvern.forge.sdk.artifact.storage.base import BaseStorage, get_file_extension
 from skyvern.forge.sdk.models import Step
 from skyvern.forge.sdk.settings_manager import SettingsManager
 
@@ -17,7 +17,7 @@ class LocalStorage(BaseStorage):
         self.artifact_path = artifact_path
 
     def build_uri(self, artifact_id: str, step: Step, artifact_type: ArtifactType) -> str:
-        file_ext = FILE_EXTENTSION_MAP[artifact_type]
+        file_ext = get_file_extension(artifact_type)
         return f"file://{self.artifact_path}/{step.task_id}/{step.order:02d}_{step.retry_index}_{step.step_id}/{datetime.utcnow().isoformat()}_{artifact_id}_{artifact_type}.{file_ext}"
 
     async def store_artifact(self, artifact: Artifact, data: bytes) -> None:
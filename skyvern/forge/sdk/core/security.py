@@ -28,16 +28,17 @@ def create_access_token(
 
 
 def generate_skyvern_signature(
-    payload: str,
+    payload: str | bytes,
     api_key: str,
 ) -> str:
     """
     Generate Skyvern signature.
 
-    :param payload: the request body
+    :param payload: the request body, str payloads are utf-8 encoded
     :param api_key: the Skyvern api key
 
     :return: the Skyvern signature
     """
-    hash_obj = hmac.new(api_key.encode("utf-8"), msg=payload.encode("utf-8"), digestmod=hashlib.sha256)
+    msg = payload.encode("utf-8") if isinstance(payload, str) else payload
+    hash_obj = hmac.new(api_key.encode("utf-8"), msg=msg, digestmod=hashlib.sha256)
     return hash_obj.hexdigest()
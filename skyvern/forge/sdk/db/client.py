@@ -1,8 +1,11 @@
+import asyncio
+import contextvars
 from datetime import datetime
 from typing import Any
 
 import structlog
-from sqlalchemy import and_, create_engine, delete
+from sqlalchemy import and_, cast, create_engine, delete, func, update
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker
 
@@ -39,10 +42,17 @@ from skyvern.forge.sdk.models import Organization, OrganizationAuthToken, Step,
 from skyvern.forge.sdk.schemas.tasks import ProxyLocation, Task, TaskStatus
 from skyvern.forge.sdk.workflow.models.parameter import AWSSecretParameter, WorkflowParameter, WorkflowParameterType
 from skyvern.forge.sdk.workflow.models.workflow import Workflow, WorkflowRun, WorkflowRunParameter, WorkflowRunStatus
+from skyvern.webeye.actions.actions import ActionType
 from skyvern.webeye.actions.models import AgentStepOutput
 
 LOG = structlog.get_logger()
 
+# Queued step updates are written in batches of up to STEP_UPDATE_BATCH_SIZE updates, collected for at most
+# STEP_UPDATE_BATCH_INTERVAL_SECONDS
+STEP_UPDATE_BATCH_SIZE = 32
+STEP_UPDATE_BATCH_INTERVAL_SECONDS = 0.02
+STEP_UPDATE_QUEUE_SIZE = 1024
+
 
 class AgentDB:
     def __init__(self, database_string: str, debug_enabled: bool = False) -> None:
@@ -50,6 +60,11 @@ class AgentDB:
         self.debug_enabled = debug_enabled
         self.engine = create_engine(database_string, json_serializer=_custom_json_serializer)
         self.Session = sessionmaker(bind=self.engine)
+        # Write-behind queue for the step status updates that don't have to be persisted before moving on
+        self.step_update_queue: asyncio.Queue[tuple[str, StepStatus]] | None = None
+        self.step_update_consumer: asyncio.Task[None] | None = None
+        # step_id -> future that is resolved once the queued update of the step is written
+        self.pending_step_updates: dict[str, asyncio.Future[None]] = {}
 
     async def create_task(
         self,
@@ -66,11 +81,12 @@ class AgentDB:
         order: int | None = None,
         retry: int | None = None,
         error_code_mapping: dict[str, str] | None = None,
+        initial_status: TaskStatus = TaskStatus.created,
     ) -> Task:
         try:
             with self.Session() as session:
                 new_task = TaskModel(
-                    status="created",
+                    status=initial_status,
                     url=url,
                     title=title,
                     webhook_callback_url=webhook_callback_url,
@@ -153,6 +169,36 @@ class AgentDB:
             LOG.exception("UnexpectedError", exc_info=True)
             raise
 
+    async def create_artifacts(self, artifacts: list[dict[str, Any]]) -> list[Artifact]:
+        """
+        Create multiple artifacts with a single batched insert.
+        :param artifacts: List of dicts with the same keys as the arguments of create_artifact
+        :return: The created artifacts in the same order as the input
+        """
+        if not artifacts:
+            return []
+        try:
+            with self.Session() as session:
+                session.add_all([ArtifactModel(**artifact) for artifact in artifacts])
+                session.commit()
+                artifact_ids = [artifact["artifact_id"] for artifact in artifacts]
+                artifact_models = {
+                    artifact_model.artifact_id: artifact_model
+                    for artifact_model in session.query(ArtifactModel)
+                    .filter(ArtifactModel.artifact_id.in_(artifact_ids))
+                    .all()
+                }
+                return [
+                    convert_to_artifact(artifact_models[artifact_id], self.debug_enabled)
+                    for artifact_id in artifact_ids
+                ]
+        except SQLAlchemyError:
+            LOG.exception("SQLAlchemyError", exc_info=True)
+            raise
+        except Exception:
+            LOG.exception("UnexpectedError", exc_info=True)
+            raise
+
     async def get_task(self, task_id: str, organization_id: str | None = None) -> Task | None:
         """Get a task by its id"""
         try:
@@ -254,6 +300,170 @@ class AgentDB:
             LOG.error("UnexpectedError", exc_info=True)
             raise
 
+    async def any_running_step(self, task_id: str, organization_id: str | None = None) -> bool:
+        try:
+            with self.Session() as session:
+                running_step_query = (
+                    session.query(StepModel)
+                    .filter_by(task_id=task_id)
+                    .filter_by(organization_id=organization_id)
+                    .filter_by(status=StepStatus.running)
+                )
+                return bool(session.query(running_step_query.exists()).scalar())
+        except SQLAlchemyError:
+            LOG.error("SQLAlchemyError", exc_info=True)
+            raise
+        except Exception:
+            LOG.error("UnexpectedError", exc_info=True)
+            raise
+
+    async def get_recent_step_action_results(
+        self, task_id: str, organization_id: str | None = None, limit: int = 1
+    ) -> list[tuple[str, datetime, list[dict[str, Any]] | None]]:
+        """
+        Get the raw action results of the last `limit` steps of the task in chronological order.
+        Only the action_results part of the step output is fetched from the db.
+        :return: List of (step_id, modified_at, action_results) tuples
+        """
+        try:
+            with self.Session() as session:
+                rows = (
+                    session.query(StepModel.step_id, StepModel.modified_at, StepModel.output["action_results"])
+                    .filter(StepModel.task_id == task_id)
+                    .filter(StepModel.organization_id == organization_id)
+                    .order_by(StepModel.order.desc())
+                    .order_by(StepModel.retry_index.desc())
+                    .limit(limit)
+                    .all()
+                )
+                return [
+                    (step_id, modified_at, step_action_results)
+                    for step_id, modified_at, step_action_results in reversed(rows)
+                ]
+        except SQLAlchemyError:
+            LOG.error("SQLAlchemyError", exc_info=True)
+            raise
+        except Exception:
+            LOG.error("UnexpectedError", exc_info=True)
+            raise
+
+    async def find_latest_step_with_action(
+        self,
+        task_id: str,
+        action_type: ActionType,
+        organization_id: str | None = None,
+        require_success: bool = False,
+    ) -> Step | None:
+        """
+        Get the latest completed step of the task that has an action of the given type. The actions are matched in
+        the database, so only the matching step is fetched.
+        :param require_success: Only match actions that have at least one successful action result
+        """
+        # actions_and_results is a list of [action, [action_result, ...]] pairs
+        action_filter = "@[0].action_type == $action_type"
+        if require_success:
+            action_filter += " && exists(@[1][*] ? (@.success == true))"
+        try:
+            with self.Session() as session:
+                step_model = (
+                    session.query(StepModel)
+                    .filter_by(task_id=task_id)
+                    .filter_by(organization_id=organization_id)
+                    .filter_by(status=StepStatus.completed)
+                    .filter(
+                        func.jsonb_path_exists(
+                            cast(StepModel.output, JSONB),
+                            cast(f"$.actions_and_results[*] ? ({action_filter})", JSONPATH),
+                            cast({"action_type": action_type.value}, JSONB),
+                        )
+                    )
+                    .order_by(StepModel.order.desc())
+                    .order_by(StepModel.retry_index.desc())
+                    .first()
+                )
+                if step_model:
+                    return convert_to_step(step_model, debug_enabled=self.debug_enabled)
+                return None
+        except SQLAlchemyError:
+            LOG.error("SQLAlchemyError", exc_info=True)
+            raise
+        except Exception:
+            LOG.error("UnexpectedError", exc_info=True)
+            raise
+
+    async def enqueue_step_update(self, step_id: str, status: StepStatus) -> None:
+        """
+        Queue a step status update to be written in the background. update_step waits for the queued update of the
+        step to be written first, so the updates of a step are never reordered.
+        """
+        if self.step_update_queue is None or self.step_update_consumer is None or self.step_update_consumer.done():
+            self.step_update_queue = asyncio.Queue(maxsize=STEP_UPDATE_QUEUE_SIZE)
+            # run the consumer in an empty context, so it doesn't inherit the log context of the first caller
+            self.step_update_consumer = asyncio.create_task(
+                self._consume_step_updates(self.step_update_queue), context=contextvars.Context()
+            )
+        await self.wait_for_step_update(step_id)
+        self.pending_step_updates[step_id] = asyncio.get_running_loop().create_future()
+        await self.step_update_queue.put((step_id, status))
+
+    async def wait_for_step_update(self, step_id: str) -> None:
+        if future := self.pending_step_updates.get(step_id):
+            await future
+
+    async def _consume_step_updates(self, queue: asyncio.Queue[tuple[str, StepStatus]]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + STEP_UPDATE_BATCH_INTERVAL_SECONDS
+                while len(batch) < STEP_UPDATE_BATCH_SIZE:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout=timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                try:
+                    self._write_step_updates(batch)
+                except Exception:
+                    # The failure is only logged, the next update of the step overwrites the status anyway
+                    LOG.error(
+                        "Failed to write queued step updates",
+                        step_ids=[step_id for step_id, _ in batch],
+                        exc_info=True,
+                    )
+                for step_id, _ in batch:
+                    future = self.pending_step_updates.pop(step_id, None)
+                    if future and not future.done():
+                        future.set_result(None)
+        finally:
+            # If the consumer stops (cancelled or crashed), the updates still queued are never written. Release their
+            # waiters, so update_step doesn't wait forever. Its own write overwrites the status anyway.
+            if self.pending_step_updates:
+                LOG.warning(
+                    "Step update consumer stopped with unwritten updates",
+                    step_ids=list(self.pending_step_updates),
+                )
+            for future in self.pending_step_updates.values():
+                if not future.done():
+                    future.set_result(None)
+            self.pending_step_updates.clear()
+
+    def _write_step_updates(self, step_updates: list[tuple[str, StepStatus]]) -> None:
+        modified_at = datetime.utcnow()
+        with self.Session() as session:
+            # bulk UPDATE by primary key, sent as a single executemany
+            session.execute(
+                update(StepModel),
+                [
+                    {"step_id": step_id, "status": status, "modified_at": modified_at}
+                    for step_id, status in step_updates
+                ],
+            )
+            session.commit()
+
     async def update_step(
         self,
         task_id: str,
@@ -265,30 +475,31 @@ class AgentDB:
         organization_id: str | None = None,
         incremental_cost: float | None = None,
     ) -> Step:
+        await self.wait_for_step_update(step_id)
+        values: dict[str, Any] = {}
+        if status is not None:
+            values["status"] = status
+        if output is not None:
+            values["output"] = output.model_dump()
+        if is_last is not None:
+            values["is_last"] = is_last
+        if retry_index is not None:
+            values["retry_index"] = retry_index
+        if incremental_cost is not None:
+            values["step_cost"] = func.coalesce(StepModel.step_cost, 0) + incremental_cost
         try:
             with self.Session() as session:
-                if (
-                    step := session.query(StepModel)
-                    .filter_by(task_id=task_id)
-                    .filter_by(step_id=step_id)
-                    .filter_by(organization_id=organization_id)
-                    .first()
-                ):
-                    if status is not None:
-                        step.status = status
-                    if output is not None:
-                        step.output = output.model_dump()
-                    if is_last is not None:
-                        step.is_last = is_last
-                    if retry_index is not None:
-                        step.retry_index = retry_index
-                    if incremental_cost is not None:
-                        step.step_cost = incremental_cost + float(step.step_cost or 0)
-
+                # UPDATE ... RETURNING, so the updated step is read back in the same round-trip
+                if step := session.scalars(
+                    update(StepModel)
+                    .where(StepModel.task_id == task_id)
+                    .where(StepModel.step_id == step_id)
+                    .where(StepModel.organization_id == organization_id)
+                    .values(**values)
+                    .returning(StepModel)
+                ).first():
+                    updated_step = convert_to_step(step, debug_enabled=self.debug_enabled)
                     session.commit()
-                    updated_step = await self.get_step(task_id, step_id, organization_id)
-                    if not updated_step:
-                        raise NotFoundError("Step not found")
                     return updated_step
                 else:
                     raise NotFoundError("Step not found")
@@ -315,26 +526,26 @@ class AgentDB:
             raise ValueError(
                 "At least one of status, extracted_information, or failure_reason must be provided to update the task"
             )
+        values: dict[str, Any] = {}
+        if status is not None:
+            values["status"] = status
+        if extracted_information is not None:
+            values["extracted_information"] = extracted_information
+        if failure_reason is not None:
+            values["failure_reason"] = failure_reason
+        if errors is not None:
+            values["errors"] = errors
         try:
             with self.Session() as session:
-                if (
-                    task := session.query(TaskModel)
-                    .filter_by(task_id=task_id)
-                    .filter_by(organization_id=organization_id)
-                    .first()
-                ):
-                    if status is not None:
-                        task.status = status
-                    if extracted_information is not None:
-                        task.extracted_information = extracted_information
-                    if failure_reason is not None:
-                        task.failure_reason = failure_reason
-                    if errors is not None:
-                        task.errors = errors
+                if task := session.scalars(
+                    update(TaskModel)
+                    .where(TaskModel.task_id == task_id)
+                    .where(TaskModel.organization_id == organization_id)
+                    .values(**values)
+                    .returning(TaskModel)
+                ).first():
+                    updated_task = convert_to_task(task, self.debug_enabled)
                     session.commit()
-                    updated_task = await self.get_task(task_id, organization_id=organization_id)
-                    if not updated_task:
-                        raise NotFoundError("Task not found")
                     return updated_task
                 else:
                     raise NotFoundError("Task not found")
@@ -1,6 +1,6 @@
 import datetime
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, Enum, ForeignKey, Integer, Numeric, String, UnicodeText
+from sqlalchemy import JSON, Boolean, Column, DateTime, Enum, ForeignKey, Index, Integer, Numeric, String, UnicodeText
 from sqlalchemy.orm import DeclarativeBase
 
 from skyvern.forge.sdk.db.enums import OrganizationAuthTokenType
@@ -49,6 +49,7 @@ class TaskModel(Base):
 
 class StepModel(Base):
     __tablename__ = "steps"
+    __table_args__ = (Index("ix_steps_task_id_status", "task_id", "status"),)
 
     step_id = Column(String, primary_key=True, index=True, default=generate_step_id)
     organization_id = Column(String, ForeignKey("organizations.organization_id"))
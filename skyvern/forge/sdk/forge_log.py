@@ -46,6 +46,14 @@ def add_kv_pairs_to_msg(logger: logging.Logger, method_name: str, event_dict: Ev
     return event_dict
 
 
+def is_log_level_enabled(level: int) -> bool:
+    """
+    Whether the log calls at the given level are kept by the LOG_LEVEL filter set up in setup_logger.
+    Use it to skip building expensive log arguments that would be dropped anyway.
+    """
+    return SettingsManager.get_settings().get_log_level() <= level
+
+
 def setup_logger() -> None:
     """
     Setup the logger with the specified format
@@ -76,13 +84,17 @@ def setup_logger() -> None:
 
     structlog.configure(
         processors=[
+            structlog.contextvars.merge_contextvars,
             structlog.processors.add_log_level,
             structlog.processors.TimeStamper(fmt="iso"),
             # structlog.processors.dict_tracebacks,
             structlog.processors.format_exc_info,
         ]
         + additional_processors
-        + [renderer]
+        + [renderer],
+        # The filtering logger turns the calls below the log level into no-ops, so the processors and the renderer
+        # (and the repr of the logged models) are skipped for them
+        wrapper_class=structlog.make_filtering_bound_logger(SettingsManager.get_settings().get_log_level()),
     )
     uvicorn_error = logging.getLogger("uvicorn.error")
     uvicorn_error.disabled = True
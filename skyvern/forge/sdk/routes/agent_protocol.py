@@ -53,7 +53,7 @@ async def webhook(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing webhook signature or timestamp")
 
     generated_signature = generate_skyvern_signature(
-        payload.decode("utf-8"),
+        payload,
         SettingsManager.get_settings().SKYVERN_API_KEY,
     )
 
@@ -2,8 +2,8 @@ import json
 from collections import Counter
 from datetime import datetime
 
-import requests
 import structlog
+from pydantic import TypeAdapter
 
 from skyvern import analytics
 from skyvern.exceptions import (
@@ -14,6 +14,7 @@ from skyvern.exceptions import (
     WorkflowRunNotFound,
 )
 from skyvern.forge import app
+from skyvern.forge.sdk.api.webhook import log_webhook_payload, post_webhook
 from skyvern.forge.sdk.artifact.models import ArtifactType
 from skyvern.forge.sdk.core import skyvern_context
 from skyvern.forge.sdk.core.security import generate_skyvern_signature
@@ -34,6 +35,9 @@ from skyvern.webeye.browser_factory import BrowserState
 
 LOG = structlog.get_logger()
 
+# send_workflow_response signs and posts the workflow run status as the bytes this adapter dumps
+WORKFLOW_RUN_STATUS_RESPONSE_ADAPTER = TypeAdapter(WorkflowRunStatusResponse)
+
 
 class WorkflowService:
     async def setup_workflow_run(
@@ -441,9 +445,8 @@ class WorkflowService:
             organization_id=workflow.organization_id,
         )
         # send task_response to the webhook callback url
-        # TODO: use async requests (httpx)
         timestamp = str(int(datetime.utcnow().timestamp()))
-        payload = workflow_run_status_response.model_dump_json()
+        payload = WORKFLOW_RUN_STATUS_RESPONSE_ADAPTER.dump_json(workflow_run_status_response)
         signature = generate_skyvern_signature(
             payload=payload,
             api_key=api_key,
@@ -458,18 +461,18 @@ class WorkflowService:
             workflow_id=workflow.workflow_id,
             workflow_run_id=workflow_run.workflow_run_id,
             webhook_callback_url=workflow_run.webhook_callback_url,
-            payload=payload,
+            payload_size=len(payload),
             headers=headers,
         )
+        log_webhook_payload(payload, workflow_run_id=workflow_run.workflow_run_id)
         try:
-            resp = requests.post(workflow_run.webhook_callback_url, data=payload, headers=headers)
-            if resp.ok:
+            resp = await post_webhook(workflow_run.webhook_callback_url, payload=payload, headers=headers)
+            if resp.is_success:
                 LOG.info(
                     "Webhook sent successfully",
                     workflow_id=workflow.workflow_id,
                     workflow_run_id=workflow_run.workflow_run_id,
                     resp_code=resp.status_code,
-                    resp_text=resp.text,
                 )
             else:
                 LOG.info(
@@ -479,7 +482,6 @@ class WorkflowService:
                     resp=resp,
                     resp_code=resp.status_code,
                     resp_text=resp.text,
-                    resp_json=resp.json(),
                 )
         except Exception as e:
             raise FailedToSendWebhook(
@@ -1,6 +1,6 @@
 import abc
 from enum import StrEnum
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
 import structlog
 from pydantic import BaseModel, Field
@@ -121,16 +121,33 @@ class CompleteAction(DecisiveAction):
     data_extraction_goal: str | None = None
 
 
-def parse_actions(task: Task, json_response: List[Dict[str, Any]]) -> List[Action]:
-    actions = []
+def web_action_element_id(action: Action) -> Any:
+    return action.element_id if isinstance(action, WebAction) else None
+
+
+def parse_actions(
+    task: Task,
+    json_response: List[Dict[str, Any]],
+    dedup_key: Callable[[Action], Any] = web_action_element_id,
+) -> tuple[List[Action], bool]:
+    """
+    Parse the actions in the LLM response. Parsing stops including actions at the first action whose dedup_key
+    repeats the dedup_key of a previous action.
+    :return: The parsed actions and whether the actions were truncated because of a duplicate
+    """
+    actions: List[Action] = []
+    seen_dedup_keys: set[Any] = set()
+    truncated = False
     for action in json_response:
         element_id = action["id"]
         reasoning = action["reasoning"] if "reasoning" in action else None
         if "action_type" not in action or action["action_type"] is None:
-            actions.append(NullAction(reasoning=reasoning))
+            if not truncated:
+                actions.append(NullAction(reasoning=reasoning))
             continue
         # `.upper()` handles the case where the LLM returns a lowercase action type (e.g. "click" instead of "CLICK")
         action_type = ActionType[action["action_type"].upper()]
+        parsed_action: Action
         if action_type == ActionType.TERMINATE:
             LOG.warning(
                 "Agent decided to terminate",
@@ -139,32 +156,30 @@ def parse_actions(task: Task, json_response: List[Dict[str, Any]]) -> List[Actio
                 reasoning=reasoning,
                 actions=actions,
             )
-            actions.append(TerminateAction(reasoning=reasoning, errors=action["errors"] if "errors" in action else []))
+            parsed_action = TerminateAction(reasoning=reasoning, errors=action["errors"] if "errors" in action else [])
         elif action_type == ActionType.CLICK:
             file_url = action["file_url"] if "file_url" in action else None
-            actions.append(ClickAction(element_id=element_id, reasoning=reasoning, file_url=file_url))
+            parsed_action = ClickAction(element_id=element_id, reasoning=reasoning, file_url=file_url)
         elif action_type == ActionType.INPUT_TEXT:
-            actions.append(InputTextAction(element_id=element_id, text=action["text"], reasoning=reasoning))
+            parsed_action = InputTextAction(element_id=element_id, text=action["text"], reasoning=reasoning)
         elif action_type == ActionType.UPLOAD_FILE:
             # TODO: see if the element is a file input element. if it's not, convert this action into a click action
 
-            actions.append(UploadFileAction(element_id=element_id, file_url=action["file_url"], reasoning=reasoning))
+            parsed_action = UploadFileAction(element_id=element_id, file_url=action["file_url"], reasoning=reasoning)
         elif action_type == ActionType.SELECT_OPTION:
-            actions.append(
-                SelectOptionAction(
-                    element_id=element_id,
-                    option=SelectOption(
-                        label=action["option"]["label"],
-                        value=action["option"]["value"],
-                        index=action["option"]["index"],
-                    ),
-                    reasoning=reasoning,
-                )
+            parsed_action = SelectOptionAction(
+                element_id=element_id,
+                option=SelectOption(
+                    label=action["option"]["label"],
+                    value=action["option"]["value"],
+                    index=action["option"]["index"],
+                ),
+                reasoning=reasoning,
             )
         elif action_type == ActionType.CHECKBOX:
-            actions.append(CheckboxAction(element_id=element_id, is_checked=action["is_checked"], reasoning=reasoning))
+            parsed_action = CheckboxAction(element_id=element_id, is_checked=action["is_checked"], reasoning=reasoning)
         elif action_type == ActionType.WAIT:
-            actions.append(WaitAction(reasoning=reasoning))
+            parsed_action = WaitAction(reasoning=reasoning)
         elif action_type == ActionType.COMPLETE:
             if actions:
                 LOG.info(
@@ -181,11 +196,11 @@ def parse_actions(task: Task, json_response: List[Dict[str, Any]]) -> List[Actio
                     data_extraction_goal=task.data_extraction_goal,
                     errors=action["errors"] if "errors" in action else [],
                 )
-            ]
+            ], False
         elif action_type == "null":
-            actions.append(NullAction(reasoning=reasoning))
+            parsed_action = NullAction(reasoning=reasoning)
         elif action_type == ActionType.SOLVE_CAPTCHA:
-            actions.append(SolveCaptchaAction(reasoning=reasoning))
+            parsed_action = SolveCaptchaAction(reasoning=reasoning)
         else:
             LOG.error(
                 "Unsupported action type when parsing actions",
@@ -193,7 +208,27 @@ def parse_actions(task: Task, json_response: List[Dict[str, Any]]) -> List[Actio
                 action_type=action_type,
                 raw_action=action,
             )
-    return actions
+            continue
+
+        # once an action is a duplicate, the rest of the actions are dropped too. keep going through them anyway, a
+        # complete action later in the list still replaces all the actions.
+        if truncated:
+            continue
+        action_dedup_key = dedup_key(parsed_action)
+        if action_dedup_key is not None:
+            # the set doesn't grow if the key was already seen
+            seen_dedup_keys_count = len(seen_dedup_keys)
+            seen_dedup_keys.add(action_dedup_key)
+            if len(seen_dedup_keys) == seen_dedup_keys_count:
+                LOG.error(
+                    "Duplicate action element id. Dropping the remaining actions",
+                    task_id=task.task_id,
+                    action=parsed_action,
+                )
+                truncated = True
+                continue
+        actions.append(parsed_action)
+    return actions, truncated
 
 
 class ScrapeResult(BaseModel):
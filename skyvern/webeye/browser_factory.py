@@ -4,7 +4,7 @@ import asyncio
 import tempfile
 import uuid
 from datetime import datetime
-from typing import Any, Awaitable, Protocol
+from typing import Any, Awaitable, Literal, Protocol
 
 import structlog
 from playwright._impl._errors import TimeoutError
@@ -197,7 +197,13 @@ class BrowserState:
             await self.pw.stop()
             LOG.info("Playwright is stopped")
 
-    async def take_screenshot(self, full_page: bool = False, file_path: str | None = None) -> bytes:
+    async def take_screenshot(
+        self,
+        full_page: bool = False,
+        file_path: str | None = None,
+        image_type: Literal["png", "jpeg"] = "png",
+        quality: int | None = None,
+    ) -> bytes:
         if not self.page:
             LOG.error("BrowserState has no page")
             raise MissingBrowserStatePage()
@@ -206,10 +212,14 @@ class BrowserState:
                 return await self.page.screenshot(
                     path=file_path,
                     full_page=full_page,
+                    type=image_type,
+                    quality=quality,
                     timeout=SettingsManager.get_settings().BROWSER_SCREENSHOT_TIMEOUT_MS,
                 )
             return await self.page.screenshot(
                 full_page=full_page,
+                type=image_type,
+                quality=quality,
                 timeout=SettingsManager.get_settings().BROWSER_SCREENSHOT_TIMEOUT_MS,
                 animations="disabled",
             )
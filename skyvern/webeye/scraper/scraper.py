@@ -1,7 +1,9 @@
 import asyncio
 import copy
 from collections import defaultdict
+from functools import cached_property
 
+import orjson
 import structlog
 from playwright.async_api import Page
 from pydantic import BaseModel
@@ -78,6 +80,23 @@ class ScrapedPage(BaseModel):
     html: str
     extracted_text: str | None = None
 
+    # The serialized forms are computed once per scraped page, no matter how many times they're recorded
+    @cached_property
+    def html_bytes(self) -> bytes:
+        return self.html.encode()
+
+    @cached_property
+    def id_to_xpath_json(self) -> bytes:
+        return orjson.dumps(self.id_to_xpath_dict, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2)
+
+    @cached_property
+    def element_tree_json(self) -> bytes:
+        return orjson.dumps(self.element_tree)
+
+    @cached_property
+    def element_tree_trimmed_json(self) -> bytes:
+        return orjson.dumps(self.element_tree_trimmed)
+
 
 async def scrape_website(
     browser_state: BrowserState,
@@ -376,7 +376,7 @@ with visualizer_tab:
                         "No screenshot available.",
                         use_column_width=True,
                     )
-                elif file_name.endswith("screenshot_action.png"):
+                elif file_name.endswith(("screenshot_action.png", "screenshot_action.jpg")):
                     streamlit_content_safe(
                         tab_post_action_screenshot,
                         tab_post_action_screenshot.image,